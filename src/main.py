@@ -1,15 +1,43 @@
 import argparse
 import logging
+import os
 import sys
 
 from src.automation import run_rpa_challenge
 
 
+def _positive_int(value: str) -> int:
+    # 0 would mean "no timeout" to Playwright but "fail at once" to the in-page timers
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if n <= 0:
+        raise argparse.ArgumentTypeError(f"must be > 0, got {n}")
+    return n
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run the RPA Challenge automation.")
     parser.add_argument("--file", type=str, default="data/input_data.xlsx")
     parser.add_argument("--headless", action="store_true")
     parser.add_argument("--perf", action="store_true", help="Minimize overhead/logging")
+    parser.add_argument(
+        "--fill",
+        default="page",
+        choices=["page", "dom", "keyboard"],
+        help=(
+            "page: all rounds in one in-browser loop (fastest); dom: batch-set values per round;"
+            " keyboard: real key events via insertText+Tab"
+        ),
+    )
+    parser.add_argument(
+        "--timeout-ms",
+        type=_positive_int,
+        # String default so argparse converts it lazily and reports bad $PW_TIMEOUT_MS as usage
+        default=os.environ.get("PW_TIMEOUT_MS", "2000"),
+        help="Element/round wait timeout in ms (default: $PW_TIMEOUT_MS or 2000)",
+    )
     parser.add_argument(
         "--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
     )
@@ -23,12 +51,18 @@ def main():
     )
     logging.basicConfig(
         level=getattr(logging, args.log_level),
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        format=fmt,
         handlers=[logging.StreamHandler(sys.stdout)],
     )
 
     # Run; automation logs a single summary line at the end
-    run_rpa_challenge(file_path=args.file, headless=args.headless, perf_mode=args.perf)
+    run_rpa_challenge(
+        file_path=args.file,
+        headless=args.headless,
+        perf_mode=args.perf,
+        fill_mode=args.fill,
+        timeout_ms=args.timeout_ms,
+    )
 
 
 
@@ -0,0 +1,160 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from src import automation  # noqa: E402
+
+
+class FakePage:
+    """Records the Playwright calls made against it."""
+
+    def __init__(self, results=None):
+        self.calls = []
+        self.results = results or {}  # expression -> canned evaluate() return value
+        self.keyboard = FakeKeyboard(self)
+
+    def evaluate(self, expression, arg=None):
+        self.calls.append(("evaluate", expression, arg))
+        return self.results.get(expression)
+
+    # Just enough of the Page API for run_rpa_challenge
+    def set_default_timeout(self, timeout):
+        pass
+
+    def goto(self, url, **kwargs):
+        self.calls.append(("goto", url))
+
+    def wait_for_selector(self, selector, timeout=None):
+        self.calls.append(("wait_for_selector", selector))
+        return FakeButton(self)
+
+    def locator(self, selector):
+        return FakeLocator(self)
+
+    def screenshot(self, path):
+        self.calls.append(("screenshot", path))
+
+
+class FakeLocator:
+    def __init__(self, page):
+        self.first = FakeButton(page)
+
+
+class FakeContext:
+    def __init__(self, page):
+        self.pages = [page]
+
+    def add_init_script(self, script):
+        pass
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakePlaywright:
+    def __init__(self, page):
+        self.chromium = self
+        self.page = page
+
+    def launch_persistent_context(self, user_data_dir, **kwargs):
+        return FakeContext(self.page)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeButton:
+    def __init__(self, page):
+        self.page = page
+
+    def click(self):
+        self.page.calls.append(("click",))
+
+    def text_content(self, timeout=None):
+        return "Congratulations!"
+
+
+class FakeKeyboard:
+    def __init__(self, page):
+        self.page = page
+
+    def insert_text(self, text):
+        self.page.calls.append(("insert_text", text))
+
+    def press(self, key):
+        self.page.calls.append(("press", key))
+
+
+def test_fill_round_waits_for_next_round():
+    page = FakePage()
+    automation._fill_round(page, FakeButton(page), [("labelFirstName", "Ada")], timeout_ms=1500)
+    assert page.calls == [
+        ("evaluate", automation._FILL_JS, [("labelFirstName", "Ada")]),
+        ("click",),
+        ("evaluate", automation._WAIT_NEXT_ROUND_JS, 1500),
+    ]
+
+
+def test_fill_round_keyboard_types_in_tab_order():
+    page = FakePage({automation._FOCUS_ORDER_JS: ["labelEmail", "labelPhone"]})
+    payload = [("labelEmail", "ada@ex.com")]
+    automation._fill_round_keyboard(page, FakeButton(page), payload, timeout_ms=1500)
+    assert page.calls == [
+        ("evaluate", automation._FOCUS_ORDER_JS, None),
+        ("insert_text", "ada@ex.com"),
+        ("press", "Tab"),
+        ("press", "Tab"),
+        ("click",),
+        ("evaluate", automation._WAIT_NEXT_ROUND_JS, 1500),
+    ]
+
+
+def test_dom_mode_skips_last_wait_and_waits_for_banner(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("PW_TRACE", raising=False)
+    (tmp_path / "rows.csv").write_text(
+        "First Name,Last Name\n" + "".join(f"Ada{i},Lovelace\n" for i in range(3))
+    )
+    page = FakePage()
+    monkeypatch.setattr(automation, "sync_playwright", lambda: FakePlaywright(page))
+
+    summary = automation.run_rpa_challenge("rows.csv", fill_mode="dom", timeout_ms=1500)
+
+    assert summary["rounds"] == 3
+    waits = [c for c in page.calls if c[:2] == ("evaluate", automation._WAIT_NEXT_ROUND_JS)]
+    assert len(waits) == 2  # none after the final submit
+    # final Submit goes straight to the results banner, then the screenshot
+    assert page.calls[-3:] == [
+        ("click",),
+        ("wait_for_selector", "text=/Congratulations/i"),
+        ("screenshot", "screenshots/result.png"),
+    ]
+
+
+def test_missing_file_fails_before_launch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def no_launch():
+        raise AssertionError("browser should not start for a missing file")
+
+    monkeypatch.setattr(automation, "sync_playwright", no_launch)
+    with pytest.raises(FileNotFoundError):
+        automation.run_rpa_challenge("missing.csv")
+
+
+def test_unknown_fill_mode_fails_before_launch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "in.csv").write_text("First Name\nAda\n")
+
+    def no_launch():
+        raise AssertionError("browser should not start for an unknown fill mode")
+
+    monkeypatch.setattr(automation, "sync_playwright", no_launch)
+    with pytest.raises(ValueError, match="fill_mode"):
+        automation.run_rpa_challenge("in.csv", fill_mode="mouse")
@@ -0,0 +1,34 @@
+import sys
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src import main as cli  # noqa: E402
+
+
+def _run_main(monkeypatch, argv):
+    calls = []
+    monkeypatch.setattr(cli, "run_rpa_challenge", lambda **kw: calls.append(kw))
+    monkeypatch.setattr(sys, "argv", ["src.main", *argv])
+    cli.main()
+    return calls[0]
+
+
+def test_timeout_from_env(monkeypatch):
+    monkeypatch.setenv("PW_TIMEOUT_MS", "3500")
+    assert _run_main(monkeypatch, [])["timeout_ms"] == 3500
+
+
+def test_bad_env_timeout_ignored_when_flag_given(monkeypatch):
+    monkeypatch.setenv("PW_TIMEOUT_MS", "abc")
+    assert _run_main(monkeypatch, ["--timeout-ms", "1200"])["timeout_ms"] == 1200
+
+
+@pytest.mark.parametrize("env,argv", [("abc", []), ("2000", ["--timeout-ms", "0"])])
+def test_invalid_timeout_is_usage_error(monkeypatch, capsys, env, argv):
+    monkeypatch.setenv("PW_TIMEOUT_MS", env)
+    with pytest.raises(SystemExit) as exc:
+        _run_main(monkeypatch, argv)
+    assert exc.value.code == 2
+    assert "--timeout-ms" in capsys.readouterr().err
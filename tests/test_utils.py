@@ -1,6 +1,7 @@
 import pytest
 import pandas as pd
 
+from src import utils
 from src.utils import read_rows
 
 CANON = [
@@ -30,6 +31,16 @@ def test_header_normalization_csv(tmp_path):
     for k in CANON:
         assert isinstance(r[k], str)
 
+def test_header_variants_map_to_canonical(tmp_path):
+    # punctuation / short forms collapse to the same token
+    p = tmp_path / "variants.csv"
+    p.write_text("First_Name,last-name,E-mail,Phone\nAda,Lovelace,ada@ex.com,00123\n")
+    r = list(read_rows(str(p)))[0]
+    assert r["First Name"] == "Ada"
+    assert r["Last Name"] == "Lovelace"
+    assert r["Email"] == "ada@ex.com"
+    assert r["Phone Number"] == "00123"
+
 def test_empty_cells_become_empty_strings(tmp_path):
     p = tmp_path / "empty.csv"
     p.write_text(
@@ -42,9 +53,14 @@ def test_empty_cells_become_empty_strings(tmp_path):
         assert k in r
         assert isinstance(r[k], str)
 
-def test_xlsx_dtype_str(tmp_path):
-    # Skip if openpyxl not installed (CI-safe)
+@pytest.mark.parametrize(
+    "engine,module", [("calamine", "python_calamine"), ("openpyxl", "openpyxl")]
+)
+def test_xlsx_dtype_str(tmp_path, monkeypatch, engine, module):
+    # Writing needs openpyxl; skip whichever reader isn't installed (CI-safe)
     pytest.importorskip("openpyxl")
+    pytest.importorskip(module)
+    monkeypatch.setattr(utils, "_EXCEL_ENGINE", engine)
     df = pd.DataFrame([{
         "First Name":"John","Last Name":"Doe","Company Name":"Acme",
         "Role in Company":"Dev","Address":"A St","Email":"j@e.com",
@@ -54,4 +70,14 @@ def test_xlsx_dtype_str(tmp_path):
     df.to_excel(x, index=False)
     rows = list(read_rows(str(x)))
     assert rows[0]["Phone Number"] == "0007"
+    assert rows[0]["First Name"] == "John"
+
 
+def test_limit_and_whitespace_strip(tmp_path):
+    p = tmp_path / "many.csv"
+    body = "".join(f"  Name{i}  ,Doe,Acme,Dev,A St,e@x.com,1\n" for i in range(15))
+    p.write_text(",".join(CANON) + "\n" + body)
+    rows = list(read_rows(str(p), limit=10))
+    assert len(rows) == 10
+    assert rows[0]["First Name"] == "Name0"
+    assert len(list(read_rows(str(p), limit=None))) == 15